@@ -1,10 +1,14 @@
+import os
+
 from flask import Flask, jsonify, request
 
-from bank import Bank, Customer
+from bank import Bank, Customer, FxRates
 from bank.exceptions import BankingError
 
 app = Flask(__name__)
 bank = Bank("Banco Aurora")
+if os.environ.get("FX_RATES_FILE"):
+    bank.fx = FxRates(os.environ["FX_RATES_FILE"])
 customers = {}
 
 
@@ -65,7 +69,7 @@ def transfer():
     data = request.get_json(force=True)
     a = bank.get_account(data["from_id"])
     b = bank.get_account(data["to_id"])
-    a.transfer_to(b, float(data["amount"]), note=data.get("note", ""))
+    bank.transfer(a.id, b.id, float(data["amount"]), note=data.get("note", ""))
     return jsonify({"from": a.snapshot(), "to": b.snapshot()})
 
 
@@ -1,10 +1,20 @@
 from .accounts import Account, CheckingAccount, InvestmentAccount, SavingsAccount
+from .audit import LedgerVerifier
 from .bank import Bank
 from .customer import Customer
 from .exceptions import (
     AccountNotFound,
     BankingError,
     CurrencyMismatch,
+    DuplicateAccount,
     InsufficientFunds,
+    LedgerIntegrityError,
     NegativeAmount,
+    RateNotAvailable,
+    VelocityLimitExceeded,
 )
+from .fx import FxRates
+from .ids import AccountIdAllocator
+from .ledger import LedgerConfig, TieredLedger
+from .rules import AccountRule, Posting, get_rule, register_rule
+from .velocity import VelocityGuard, VelocityLimit
@@ -1,25 +1,56 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass, field
+from abc import ABC
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any, Dict, List
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
+from .audit import CHECKPOINT_INTERVAL, GENESIS_HASH, Checkpoint, chain_hash, sign_checkpoint
 from .exceptions import CurrencyMismatch, InsufficientFunds, NegativeAmount
+from .ledger import TieredLedger
+from .rules import Posting, get_rule
+
+if TYPE_CHECKING:
+    from .fx import FxRates
+    from .snapshot import SnapshotManager
+    from .velocity import VelocityGuard
+
+# Ledger kinds that reduce the balance; every other kind is a credit.
+DEBIT_KINDS = {"withdraw", "transfer_out", "fee"}
 
 
 @dataclass
 class Transaction:
-    kind: str  # 'deposit', 'withdraw', 'transfer_in', 'transfer_out', 'fee', 'yield', 'interest'
+    kind: str  # 'opening', 'deposit', 'withdraw', 'transfer_in', 'transfer_out', 'fee', 'yield', 'interest'
     amount: float
     balance_after: float
     timestamp: datetime
     note: str = ""
+    hash: str = ""  # HMAC-SHA256 chained over the previous row (see bank.audit)
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d["timestamp"] = self.timestamp.isoformat()
-        return d
+        # Built by hand: asdict() deep-copies every field, which dominates sealing/dumps.
+        return {
+            "kind": self.kind,
+            "amount": self.amount,
+            "balance_after": self.balance_after,
+            "timestamp": self.timestamp.isoformat(),
+            "note": self.note,
+            "hash": self.hash,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Transaction":
+        return cls(
+            d["kind"],
+            d["amount"],
+            d["balance_after"],
+            datetime.fromisoformat(d["timestamp"]),
+            d.get("note", ""),
+            d.get("hash", ""),
+        )
 
 
 @dataclass
@@ -28,7 +59,21 @@ class Account(ABC):
     owner_id: str
     currency: str = "BRL"
     balance: float = 0.0
-    _ledger: List[Transaction] = field(default_factory=list, init=False, repr=False)
+    rule: str = ""  # key in bank.rules.RULES; each subclass sets its product default
+    _ledger: TieredLedger = field(default_factory=TieredLedger, init=False, repr=False)
+    _checkpoints: List[Checkpoint] = field(default_factory=list, init=False, repr=False)
+    # Pre-posting hook for withdrawals/transfers, wired by Bank (see bank.velocity).
+    _guard: Optional["VelocityGuard"] = field(default=None, init=False, repr=False, compare=False)
+    # Copy-on-write read views, wired by Bank (see bank.snapshot).
+    _versions: Optional["SnapshotManager"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _epoch: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # The opening balance is a ledger row too, so balance == replay(ledger) always holds.
+        if self.balance:
+            self._record("opening", self.balance, "opening balance")
 
     def _assert_positive(self, amount: float):
         if amount <= 0:
@@ -39,52 +84,132 @@ class Account(ABC):
             raise CurrencyMismatch(f"Currency mismatch: {self.currency} vs {other.currency}")
 
     def _record(self, kind: str, amount: float, note: str = ""):
-        self._ledger.append(
-            Transaction(
-                kind,
-                round(amount, 2),
-                round(self.balance, 2),
-                datetime.now(UTC),
-                note,
-            )
+        tx = Transaction(
+            kind,
+            round(amount, 2),
+            round(self.balance, 2),
+            datetime.now(UTC),
+            note,
         )
+        tx.hash = chain_hash(self._ledger[-1].hash if self._ledger else GENESIS_HASH, self.id, tx)
+        self._ledger.append(tx)
+        if len(self._ledger) % CHECKPOINT_INTERVAL == 0:
+            self._checkpoints.append(
+                sign_checkpoint(self.id, len(self._ledger), tx.balance_after, tx.hash)
+            )
+
+    def _post(self, kind: str, delta: float, note: str = "", seal: bool = True):
+        """Single write path: move the balance by `delta` and append the matching ledger row.
+
+        Pass `seal=False` when already inside `_atomic()` and call `_ledger.seal()` after
+        leaving it, so cold history is never written to disk under the bank-wide lock.
+        """
+        if (delta < 0) != (kind in DEBIT_KINDS):
+            raise ValueError(f"Ledger kind {kind!r} does not match the sign of {delta}")
+        with self._atomic():
+            if self._versions is not None:
+                self._versions.preserve(self)
+            self.balance += delta
+            self._record(kind, abs(delta), note)
+        if seal:
+            self._ledger.seal()
+
+    def _atomic(self):
+        """Make a group of postings appear at once to read views."""
+        return self._versions.lock if self._versions is not None else nullcontext()
 
     @property
     def ledger(self) -> List[Transaction]:
         return list(self._ledger)
 
+    @property
+    def ledger_size(self) -> int:
+        return len(self._ledger)
+
+    def iter_ledger(self, start: int = 0) -> Iterator[Transaction]:
+        """Stream the ledger (cold segments are read one at a time)."""
+        return self._ledger.iter_from(start)
+
     def deposit(self, amount: float, note: str = "") -> None:
         self._assert_positive(amount)
-        self.balance += amount
-        self._record("deposit", amount, note or "deposit")
+        self._post("deposit", amount, note or "deposit")
 
     def withdraw(self, amount: float, note: str = "") -> None:
         self._assert_positive(amount)
         if amount > self.balance:
             raise InsufficientFunds("Insufficient funds.")
-        self.balance -= amount
-        self._record("withdraw", amount, note or "withdraw")
-
-    def transfer_to(self, other: "Account", amount: float, note: str = "") -> None:
-        self._assert_currency(other)
-        self.withdraw(amount, note or f"transfer to {other.id}")
-        other.deposit(amount, note or f"transfer from {self.id}")
-        self._record("transfer_out", amount, note or f"to {other.id}")
-        other._record("transfer_in", amount, note or f"from {self.id}")
+        if self._guard:
+            self._guard.check(self, "withdraw", amount)
+        self._post("withdraw", -amount, note or "withdraw")
+        if self._guard:
+            self._guard.observe(self, "withdraw", amount)
+
+    def transfer_to(
+        self, other: "Account", amount: float, note: str = "", fx: Optional["FxRates"] = None
+    ) -> None:
+        """Move `amount` (in this account's currency); `fx` enables cross-currency transfers."""
+        if fx is None or self.currency == other.currency:
+            self._assert_currency(other)
+        self._assert_positive(amount)
+        if amount > self.balance:
+            raise InsufficientFunds("Insufficient funds.")
+        out_note = note or f"transfer to {other.id}"
+        in_note = note or f"transfer from {self.id}"
+        credited = amount
+        if self.currency != other.currency:
+            credited, rate = fx.convert(amount, self.currency, other.currency)
+            self._assert_positive(credited)
+            fx_note = (
+                f"fx {self.currency}->{other.currency} @ {rate:.6f}: "
+                f"{amount:.2f} {self.currency} = {credited:.2f} {other.currency}"
+            )
+            out_note, in_note = f"{out_note} | {fx_note}", f"{in_note} | {fx_note}"
+        if self._guard:
+            self._guard.check(self, "transfer_out", amount)
+        with self._atomic():
+            self._post("transfer_out", -amount, out_note, seal=False)
+            other._post("transfer_in", credited, in_note, seal=False)
+        self._ledger.seal()
+        other._ledger.seal()
+        if self._guard:
+            self._guard.observe(self, "transfer_out", amount)
+
+    def evaluate_rules(self) -> List[Posting]:
+        """Run the account's rule strategy without touching its state."""
+        return get_rule(self.rule).evaluate(self)
+
+    def apply_postings(self, postings: List[Posting]) -> None:
+        for p in postings:
+            self._post(p.kind, p.delta, p.note)
+
+    def restore_ledger(self, rows: List[Dict[str, Any]], checkpoints: List[Dict[str, Any]]):
+        """Replace the ledger with persisted rows (hashes kept as stored, for auditing)."""
+        self._ledger = TieredLedger()
+        self._ledger.extend(Transaction.from_dict(r) for r in rows)
+        self._checkpoints = [Checkpoint(**cp) for cp in checkpoints]
 
-    @abstractmethod
     def end_of_day(self) -> None:
-        """Domain hook: each account type applies its own rules daily (fees, interest, yields)."""
-        ...
-
-    def snapshot(self) -> Dict[str, Any]:
+        """Domain hook: each account type applies its own rules daily (fees, interest, yields).
+
+        The rules come from the strategy selected by `rule` (see bank.rules).
+        """
+        self.apply_postings(self.evaluate_rules())
+
+    def snapshot(
+        self, balance: Optional[float] = None, ledger_len: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Serializable state; `balance`/`ledger_len` pin it to a read view's point in time."""
+        balance = self.balance if balance is None else balance
+        n = len(self._ledger) if ledger_len is None else ledger_len
         return {
             "id": self.id,
             "owner_id": self.owner_id,
             "currency": self.currency,
-            "balance": round(self.balance, 2),
+            "balance": round(balance, 2),
             "type": self.__class__.__name__,
-            "ledger": [t.to_dict() for t in self._ledger],
+            "rule": self.rule,
+            "ledger": [t.to_dict() for t in islice(self._ledger, n)],
+            "checkpoints": [cp.to_dict() for cp in self._checkpoints if cp.index <= n],
         }
 
 
@@ -92,42 +217,17 @@ class Account(ABC):
 class CheckingAccount(Account):
     maintenance_fee: float = 3.90
     minimum_balance: float = 50.0
-
-    def end_of_day(self) -> None:
-        # Apply maintenance only if balance below threshold
-        if self.balance < self.minimum_balance and self.maintenance_fee > 0:
-            fee = min(self.maintenance_fee, self.balance) if self.balance > 0 else 0.0
-            if fee > 0:
-                self.balance -= fee
-                self._record("fee", fee, f"maintenance (< {self.minimum_balance} {self.currency})")
+    rule: str = "checking"  # rules.MaintenanceFeeRule
 
 
 @dataclass
 class SavingsAccount(Account):
     daily_interest_rate: float = 0.0005  # ~0.05% per day ~ 1.5%/mo simplified
-
-    def end_of_day(self) -> None:
-        if self.balance > 0 and self.daily_interest_rate > 0:
-            interest = self.balance * self.daily_interest_rate
-            self.balance += interest
-            self._record("interest", interest, f"{self.daily_interest_rate*100:.4f}% daily")
+    rule: str = "savings"  # rules.DailyInterestRule
 
 
 @dataclass
 class InvestmentAccount(Account):
     risk_level: int = 3  # 1..5
     management_fee_daily: float = 0.0001  # 0.01% per day
-
-    def end_of_day(self) -> None:
-        # Simple stochastic-like yield: deterministic pseudo-variance by risk_level
-        # (No randomness to keep tests deterministic)
-        base_yield = 0.0003 + (self.risk_level - 3) * 0.00015  # [-0.0003 .. 0.0006] around 0.0003
-        gross = self.balance * base_yield if self.balance > 0 else 0.0
-        fee = self.balance * self.management_fee_daily if self.balance > 0 else 0.0
-        delta = gross - fee
-        if delta != 0:
-            self.balance += delta
-            if gross:
-                self._record("yield", gross, f"base_yield {base_yield*100:.4f}%")
-            if fee:
-                self._record("fee", fee, f"mgmt {self.management_fee_daily*100:.4f}%")
+    rule: str = "investment"  # rules.RiskYieldRule
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import warnings
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from .exceptions import LedgerIntegrityError
+
+if TYPE_CHECKING:
+    from .accounts import Account, Transaction
+
+GENESIS_HASH = "0" * 64
+CHECKPOINT_INTERVAL = 1024  # ledger rows between signed checkpoints
+DEV_LEDGER_KEY = "banco-aurora-dev"
+
+
+def _ledger_key() -> bytes:
+    key = os.environ.get("BANK_LEDGER_KEY")
+    if not key:
+        warnings.warn(
+            "BANK_LEDGER_KEY is not set: ledger checkpoints are signed with the public "
+            "development key and can be forged. Set BANK_LEDGER_KEY in any real deployment.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        key = DEV_LEDGER_KEY
+    return key.encode()
+
+
+LEDGER_KEY = _ledger_key()
+# Each row stores rounded amount/balance_after, so a recomputed step may be off by one cent.
+CENT_TOLERANCE = 0.01 + 1e-9
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    index: int  # number of ledger rows covered
+    balance: float
+    hash: str
+    signature: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def chain_hash(prev_hash: str, account_id: str, tx: "Transaction", key: bytes = LEDGER_KEY) -> str:
+    """HMAC-SHA256 of the row chained over the previous one.
+
+    Keyed, so every row (including the tail after the last checkpoint) is covered by the
+    ledger key: edited rows cannot be re-chained without it.
+    """
+    payload = (
+        f"{prev_hash}|{account_id}|{tx.kind}|{tx.amount:.2f}|{tx.balance_after:.2f}"
+        f"|{tx.timestamp.isoformat()}|{tx.note}"
+    )
+    return hmac.new(key, payload.encode(), hashlib.sha256).hexdigest()
+
+
+def _signature(account_id: str, index: int, balance: float, head: str, key: bytes) -> str:
+    msg = f"{account_id}|{index}|{balance:.2f}|{head}".encode()
+    return hmac.new(key, msg, hashlib.sha256).hexdigest()
+
+
+def sign_checkpoint(
+    account_id: str, index: int, balance: float, head: str, key: bytes = LEDGER_KEY
+) -> Checkpoint:
+    return Checkpoint(index, balance, head, _signature(account_id, index, balance, head, key))
+
+
+def checkpoint_is_valid(account_id: str, cp: Checkpoint, key: bytes = LEDGER_KEY) -> bool:
+    expected = _signature(account_id, cp.index, cp.balance, cp.hash, key)
+    return hmac.compare_digest(expected, cp.signature)
+
+
+class LedgerVerifier:
+    """Recompute ledger hash chains and running balances, resuming where the last run stopped.
+
+    The verifier remembers the last verified position of each account; on the next run it
+    only replays rows appended since then. Without previous state it resumes from the latest
+    correctly signed checkpoint (or from the first row when `full=True`).
+    """
+
+    def __init__(self, key: bytes = LEDGER_KEY):
+        self.key = key
+        self._verified: Dict[str, Tuple[int, str, float]] = {}
+
+    def _resume_point(self, account: "Account", full: bool) -> Tuple[int, str, float]:
+        ledger = account._ledger
+        state = self._verified.get(account.id)
+        if not full and state and 0 < state[0] <= len(ledger):
+            if ledger[state[0] - 1].hash == state[1]:
+                return state
+        if not full:
+            for cp in reversed(account._checkpoints):
+                if (
+                    cp.index <= len(ledger)
+                    and checkpoint_is_valid(account.id, cp, self.key)
+                    and ledger[cp.index - 1].hash == cp.hash
+                ):
+                    return cp.index, cp.hash, cp.balance
+        return 0, GENESIS_HASH, 0.0
+
+    def verify(self, account: "Account", full: bool = False) -> int:
+        """Verify one account; returns how many rows were replayed."""
+        from .accounts import DEBIT_KINDS
+
+        start, head, balance = self._resume_point(account, full)
+        ledger = account._ledger
+        checkpoints = {cp.index: cp for cp in account._checkpoints if cp.index > start}
+        end = start
+        for i, tx in enumerate(ledger.iter_from(start), start):
+            end = i + 1
+            delta = -tx.amount if tx.kind in DEBIT_KINDS else tx.amount
+            if abs(balance + delta - tx.balance_after) > CENT_TOLERANCE:
+                raise LedgerIntegrityError(f"{account.id}: balance break at row {i}")
+            head = chain_hash(head, account.id, tx, self.key)
+            if head != tx.hash:
+                raise LedgerIntegrityError(f"{account.id}: hash chain break at row {i}")
+            balance = tx.balance_after
+            cp = checkpoints.get(i + 1)
+            if cp and (
+                cp.hash != head
+                or cp.balance != balance
+                or not checkpoint_is_valid(account.id, cp, self.key)
+            ):
+                raise LedgerIntegrityError(f"{account.id}: bad checkpoint at row {i + 1}")
+        if abs(round(account.balance, 2) - balance) > CENT_TOLERANCE / 2:
+            raise LedgerIntegrityError(
+                f"{account.id}: balance {account.balance:.2f} != ledger {balance:.2f}"
+            )
+        self._verified[account.id] = (end, head, balance)
+        return end - start
+
+    def verify_all(
+        self, accounts: Iterable["Account"], full: bool = False
+    ) -> Dict[str, Optional[str]]:
+        """Verify many accounts; maps account id to the error message (None when intact)."""
+        report: Dict[str, Optional[str]] = {}
+        for acc in accounts:
+            try:
+                self.verify(acc, full=full)
+                report[acc.id] = None
+            except LedgerIntegrityError as e:
+                report[acc.id] = str(e)
+        return report
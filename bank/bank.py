@@ -1,12 +1,24 @@
 from __future__ import annotations
 
 import json
-import uuid
-from dataclasses import asdict, dataclass, field
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Optional
 
 from .accounts import Account, CheckingAccount, InvestmentAccount, SavingsAccount
-from .exceptions import AccountNotFound
+from .exceptions import AccountNotFound, DuplicateAccount
+from .fx import FxRates
+from .ids import AccountIdAllocator
+from .rules import evaluate_chunk, get_rule
+from .snapshot import ReadView, SnapshotManager
+from .velocity import VelocityGuard
+
+
+def _rule_copy(acc: Account) -> Account:
+    """Copy of the init fields only, built without `__post_init__` (no ledger, no hooks)."""
+    copy = object.__new__(type(acc))
+    copy.__dict__.update({f.name: getattr(acc, f.name) for f in fields(acc) if f.init})
+    return copy
 
 
 @dataclass
@@ -14,22 +26,55 @@ class Bank:
     name: str
     accounts: Dict[str, Account] = field(default_factory=dict)
     customers: Dict[str, dict] = field(default_factory=dict)
+    ids: AccountIdAllocator = field(default_factory=AccountIdAllocator, repr=False)
+    fx: Optional[FxRates] = field(default=None, repr=False)
+    guard: Optional[VelocityGuard] = field(default=None, repr=False)
+    # Dense internal indexing: row i <-> _rows[i], for array-backed bulk processing.
+    _rows: List[Account] = field(default_factory=list, init=False, repr=False)
+    _row_of: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _versions: SnapshotManager = field(default_factory=SnapshotManager, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.guard is not None and self.guard.fx is None:
+            self.guard.fx = self.fx
+        accounts, self.accounts = self.accounts, {}
+        for acc in accounts.values():
+            self._add(acc)
+
+    def _add(self, acc: Account) -> None:
+        if acc.id in self.accounts:
+            raise DuplicateAccount(acc.id)
+        self.ids.observe(acc.id)
+        acc._guard = self.guard
+        acc._versions = self._versions
+        with self._versions.lock:
+            self._row_of[acc.id] = len(self._rows)
+            self._rows.append(acc)
+            self.accounts[acc.id] = acc
 
     def register_customer(self, customer) -> None:
         self.customers[customer.id] = asdict(customer)
 
     def open_account(self, owner_id: str, kind: str, **kwargs) -> Account:
-        account_id = str(uuid.uuid4())[:8]
+        return self.open_accounts([dict(owner_id=owner_id, kind=kind, **kwargs)])[0]
+
+    def open_accounts(self, specs: Iterable[Dict[str, Any]]) -> List[Account]:
+        """Bulk opening: each spec is `{owner_id, kind, **account_kwargs}`."""
         klass = {
             "checking": CheckingAccount,
             "savings": SavingsAccount,
             "investment": InvestmentAccount,
         }
-        if kind not in klass:
-            raise ValueError(f"Unknown account type: {kind}")
-        acc = klass[kind](id=account_id, owner_id=owner_id, **kwargs)
-        self.accounts[acc.id] = acc
-        return acc
+        specs = [dict(spec) for spec in specs]
+        for spec in specs:
+            if spec.get("kind") not in klass:
+                raise ValueError(f"Unknown account type: {spec.get('kind')}")
+        opened = []
+        for account_id, spec in zip(self.ids.allocate(len(specs)), specs):
+            acc = klass[spec.pop("kind")](id=account_id, **spec)
+            self._add(acc)
+            opened.append(acc)
+        return opened
 
     def get_account(self, account_id: str) -> Account:
         try:
@@ -37,17 +82,59 @@ class Bank:
         except KeyError:
             raise AccountNotFound(account_id)
 
-    def end_of_day(self) -> None:
-        for acc in self.accounts.values():
-            acc.end_of_day()
+    def row_of(self, account_id: str) -> int:
+        """Dense internal row of an account (stable for the lifetime of this Bank)."""
+        try:
+            return self._row_of[account_id]
+        except KeyError:
+            raise AccountNotFound(account_id)
+
+    def account_at(self, row: int) -> Account:
+        return self._rows[row]
+
+    def transfer(self, from_id: str, to_id: str, amount: float, note: str = "") -> None:
+        """Transfer between accounts, converting through `self.fx` when currencies differ."""
+        if self.fx is not None:
+            self.fx.maybe_reload()
+        a = self.get_account(from_id)
+        b = self.get_account(to_id)
+        a.transfer_to(b, amount, note=note, fx=self.fx)
+
+    def end_of_day(self, workers: Optional[int] = None, chunk_size: int = 2048) -> None:
+        """Apply each account's rules.
+
+        With `workers > 1` the rules are evaluated over chunks of accounts in a process pool
+        and the resulting postings are applied back in account order, so the outcome is the
+        same as the serial run.
+        """
+        if not workers or workers <= 1:
+            for acc in self.accounts.values():
+                acc.end_of_day()
+            return
+        # Workers get ledger-less copies: rules only need balance and product parameters.
+        accounts = [_rule_copy(acc) for acc in self.accounts.values()]
+        chunks = [accounts[i : i + chunk_size] for i in range(0, len(accounts), chunk_size)]
+        # Each chunk carries its rule objects (fails fast here on unknown rules).
+        rules = [{acc.rule: get_rule(acc.rule) for acc in chunk} for chunk in chunks]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(evaluate_chunk, chunks, rules))
+        # Nothing is posted unless every chunk succeeded, so a failed run can be retried.
+        for postings in results:
+            for p in postings:
+                self.accounts[p.account_id].apply_postings([p])
+
+    def read_view(self) -> ReadView:
+        """O(1) point-in-time view for exports/reports that run alongside posting."""
+        return self._versions.open(self)
 
     # Persistence (simple JSON)
     def dump_json(self) -> str:
-        payload = {
-            "name": self.name,
-            "customers": self.customers,
-            "accounts": {aid: acc.snapshot() for aid, acc in self.accounts.items()},
-        }
+        with self.read_view() as view:
+            payload = {
+                "name": self.name,
+                "customers": dict(self.customers),
+                "accounts": {acc.id: view.snapshot(acc) for acc in view.accounts()},
+            }
         return json.dumps(payload, indent=2)
 
     @classmethod
@@ -55,7 +142,7 @@ class Bank:
         data = json.loads(s)
         bank = cls(name=data["name"])
         bank.customers = data.get("customers", {})
-        for aid, adata in data.get("accounts", {}).items():
+        for adata in data.get("accounts", {}).values():
             kind = adata["type"].lower().replace("account", "")
             klass = {
                 "checking": CheckingAccount,
@@ -66,7 +153,13 @@ class Bank:
                 id=adata["id"],
                 owner_id=adata["owner_id"],
                 currency=adata["currency"],
-                balance=adata["balance"],
+                balance=0.0 if adata.get("ledger") else adata["balance"],
             )
-            bank.accounts[aid] = acc
+            if adata.get("ledger"):
+                # Keep history and hashes as persisted; LedgerVerifier flags any drift.
+                acc.restore_ledger(adata["ledger"], adata.get("checkpoints", []))
+                acc.balance = adata["balance"]
+            if adata.get("rule"):
+                acc.rule = adata["rule"]
+            bank._add(acc)
         return bank
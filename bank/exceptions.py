@@ -14,5 +14,21 @@ class CurrencyMismatch(BankingError):
     pass
 
 
+class RateNotAvailable(CurrencyMismatch):
+    pass
+
+
 class AccountNotFound(BankingError):
     pass
+
+
+class DuplicateAccount(BankingError):
+    pass
+
+
+class LedgerIntegrityError(BankingError):
+    pass
+
+
+class VelocityLimitExceeded(BankingError):
+    pass
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .exceptions import RateNotAvailable
+
+log = logging.getLogger(__name__)
+
+
+class FxRates:
+    """Locally loaded FX table with a precomputed cross-rate matrix.
+
+    File format (JSON)::
+
+        {"base": "BRL", "rates": {"USD": 0.19, "EUR": 0.17}, "pairs": {"EUR/USD": 1.09}}
+
+    `rates` are units of each currency per 1 `base`; every other cross rate (and every
+    inverse) is triangulated through the base once at load time. Optional `pairs` quote a
+    direct rate (units of the second currency per 1 of the first) that overrides the
+    triangulated one. `rate()` is then a constant-time matrix lookup.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        # (currencies, index, matrix), replaced as a whole on reload; read it once per lookup.
+        self._table: Tuple[List[str], Dict[str, int], List[List[float]]] = ([], {}, [])
+        self._mtime = 0.0
+        self._checked_at = 0.0
+        if path:
+            self.reload(force=True)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FxRates":
+        fx = cls()
+        fx.load_dict(data)
+        return fx
+
+    def load_dict(self, data: Dict) -> None:
+        base = data["base"]
+        rates = {base: 1.0, **{k: float(v) for k, v in data.get("rates", {}).items()}}
+        pairs = {}
+        for pair, quote in data.get("pairs", {}).items():
+            src, dst = pair.split("/")
+            pairs[(src, dst)] = float(quote)
+        # Currencies quoted only in `pairs` get a base rate derived through the pair, so
+        # they triangulate like any other currency.
+        derived = True
+        while derived:
+            derived = False
+            for (src, dst), quote in pairs.items():
+                if src in rates and dst not in rates:
+                    rates[dst] = rates[src] * quote
+                    derived = True
+                elif dst in rates and src not in rates:
+                    rates[src] = rates[dst] / quote
+                    derived = True
+        for src, dst in pairs:
+            rates.setdefault(src, 0.0)
+            rates.setdefault(dst, 0.0)
+        currencies = sorted(rates)
+        index = {c: i for i, c in enumerate(currencies)}
+        nan = float("nan")
+        # matrix[i][j]: units of currencies[j] per 1 unit of currencies[i]; NaN = unknown
+        matrix = [
+            [rates[dst] / rates[src] if rates[src] and rates[dst] else nan for dst in currencies]
+            for src in currencies
+        ]
+        for (src, dst), quote in pairs.items():
+            matrix[index[src]][index[dst]] = quote
+            matrix[index[dst]][index[src]] = 1.0 / quote
+        for i in range(len(currencies)):
+            matrix[i][i] = 1.0
+        # A single attribute store, so concurrent readers see either the old or the new table.
+        self._table = (currencies, index, matrix)
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-read the file if it changed on disk; returns True when rates were reloaded.
+
+        A missing, unreadable or half-written file keeps the last good table (and is
+        retried on the next check), so transfers never fail because of a bad rate file.
+        """
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime
+            if not force and mtime == self._mtime:
+                return False
+            with open(self.path, encoding="utf-8") as f:
+                self.load_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+            log.error("FX rates not reloaded from %s, keeping previous table: %s", self.path, e)
+            return False
+        self._mtime = mtime
+        return True
+
+    def maybe_reload(self) -> bool:
+        """`reload()` at most once per `check_interval` seconds (cheap on the hot path)."""
+        if self.path and time.monotonic() - self._checked_at >= self.check_interval:
+            return self.reload()
+        return False
+
+    @property
+    def currencies(self) -> List[str]:
+        return self._table[0]
+
+    def rate(self, src: str, dst: str) -> float:
+        _, index, matrix = self._table
+        try:
+            r = matrix[index[src]][index[dst]]
+        except KeyError:
+            raise RateNotAvailable(f"No FX rate for {src}->{dst}")
+        if r != r:  # NaN: neither quoted nor reachable through the base
+            raise RateNotAvailable(f"No FX rate for {src}->{dst}")
+        return r
+
+    def convert(self, amount: float, src: str, dst: str) -> Tuple[float, float]:
+        """Return `(converted_amount, rate_used)`; the amount is rounded to cents."""
+        r = self.rate(src, dst)
+        return round(amount * r, 2), r
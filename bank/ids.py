@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, List
+
+SEQ_LIMIT = 10_000  # ids per millisecond per node
+
+
+def luhn_digit(digits: str) -> str:
+    """Luhn check digit for a string of decimal digits."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2 == 0:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_id(account_id: str) -> bool:
+    return (
+        len(account_id) == 20
+        and account_id.isdigit()
+        and luhn_digit(account_id[:-1]) == account_id[-1]
+    )
+
+
+class AccountIdAllocator:
+    """Unique, time-sortable account ids.
+
+    Layout (20 digits): 13-digit epoch milliseconds, 2-digit node, 4-digit sequence and a
+    Luhn check digit. Ids never repeat within a node: the clock is never allowed to go back,
+    and when a millisecond's sequence is exhausted the allocator moves on to the next one.
+    Processes allocating concurrently must use distinct `node` values.
+    """
+
+    def __init__(self, node: int = 0, clock: Callable[[], int] = time.time_ns):
+        if not 0 <= node < 100:
+            raise ValueError("node must be in 0..99")
+        self.node = node
+        self._clock = clock
+        self._ms = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _advance(self) -> None:
+        now = self._clock() // 1_000_000
+        if now > self._ms:
+            self._ms, self._seq = now, 0
+        elif self._seq >= SEQ_LIMIT:
+            self._ms, self._seq = self._ms + 1, 0
+
+    def observe(self, account_id: str) -> None:
+        """Never allocate at or below an existing id (e.g. ids loaded from a dump)."""
+        if not is_valid_id(account_id):
+            return
+        ms, node, seq = int(account_id[:13]), int(account_id[13:15]), int(account_id[15:19])
+        with self._lock:
+            if ms > self._ms:
+                self._ms, self._seq = ms, 0
+            if ms == self._ms and node == self.node:
+                self._seq = max(self._seq, seq + 1)
+
+    def next_id(self) -> str:
+        return self.allocate(1)[0]
+
+    def allocate(self, n: int) -> List[str]:
+        """Allocate `n` ids in one critical section (bulk account opening)."""
+        out: List[str] = []
+        with self._lock:
+            while len(out) < n:
+                self._advance()
+                take = min(n - len(out), SEQ_LIMIT - self._seq)
+                prefix = f"{self._ms:013d}{self.node:02d}"
+                for seq in range(self._seq, self._seq + take):
+                    body = f"{prefix}{seq:04d}"
+                    out.append(body + luhn_digit(body))
+                self._seq += take
+        return out
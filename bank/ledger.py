@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .accounts import Transaction
+
+
+@dataclass(frozen=True)
+class LedgerConfig:
+    max_hot_rows: Optional[int] = None  # hard cap of in-memory rows per account; None = unbounded
+    segment_rows: int = 4096  # max rows per on-disk segment (at most max_hot_rows // 2)
+    directory: str = field(
+        default_factory=lambda: os.path.join(tempfile.gettempdir(), "banco_aurora_ledger")
+    )
+    cache_segments: int = 8  # decoded cold segments kept process-wide for random access
+
+
+def _config_from_env() -> LedgerConfig:
+    kwargs = {}
+    if os.environ.get("BANK_LEDGER_HOT_ROWS"):
+        kwargs["max_hot_rows"] = int(os.environ["BANK_LEDGER_HOT_ROWS"])
+    if os.environ.get("BANK_LEDGER_DIR"):
+        kwargs["directory"] = os.environ["BANK_LEDGER_DIR"]
+    return LedgerConfig(**kwargs)
+
+
+# Used by ledgers created afterwards; replace it to change the memory cap.
+LEDGER_CONFIG = _config_from_env()
+
+
+@dataclass(frozen=True)
+class SegmentIndex:
+    path: str
+    start: int  # absolute row of the first entry
+    rows: int
+    first_ts: datetime
+    last_ts: datetime
+    start_balance: float  # balance before the first entry
+
+
+def _read_segment(seg: SegmentIndex) -> List["Transaction"]:
+    from .accounts import Transaction
+
+    with gzip.open(seg.path, "rt", encoding="utf-8") as f:
+        return [Transaction.from_dict(json.loads(line)) for line in f]
+
+
+class _SegmentCache:
+    """Process-wide LRU of decoded segments, so random reads stay bounded across accounts."""
+
+    def __init__(self):
+        self._rows: "OrderedDict[str, List[Transaction]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, seg: SegmentIndex) -> List["Transaction"]:
+        with self._lock:
+            rows = self._rows.get(seg.path)
+            if rows is not None:
+                self._rows.move_to_end(seg.path)
+                return rows
+        rows = _read_segment(seg)
+        with self._lock:
+            self._rows[seg.path] = rows
+            while len(self._rows) > LEDGER_CONFIG.cache_segments:
+                self._rows.popitem(last=False)
+        return rows
+
+    def peek(self, seg: SegmentIndex) -> Optional[List["Transaction"]]:
+        with self._lock:
+            return self._rows.get(seg.path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+SEGMENT_CACHE = _SegmentCache()
+
+
+class TieredLedger:
+    """Append-only ledger that keeps recent rows in memory and seals older ones to disk.
+
+    At most `max_hot_rows` rows stay in memory: when that is exceeded, `seal()` writes the
+    oldest rows to an immutable gzip JSON-lines segment and drops them from RAM. Sealing is
+    not done by `append()` itself; callers run `seal()` once they have released their own
+    locks, so the disk write never stalls other writers or readers. Reads are transparent
+    (`len`, indexing, slicing, iteration): streaming reads decode one segment at a time
+    without caching, random access goes through a small process-wide cache.
+
+    Segments belong to the ledger that sealed them (in its own directory) and are removed
+    when it is garbage collected or `close()`d.
+    """
+
+    def __init__(self, config: Optional[LedgerConfig] = None):
+        self.config = config or LEDGER_CONFIG
+        if self.config.max_hot_rows is not None and self.config.max_hot_rows < 1:
+            raise ValueError("max_hot_rows must be at least 1")
+        # (segments, rows on disk, hot rows); swapped as a whole so readers never see a
+        # half-sealed state.
+        self._state: Tuple[List[SegmentIndex], int, List["Transaction"]] = ([], 0, [])
+        self._lock = threading.Lock()  # guards appends vs. publishing a sealed segment
+        self._sealing = False
+        self._directory: Optional[str] = None
+        self._finalizer = None
+
+    def __getstate__(self):
+        return {"config": self.config, "_state": self._state}
+
+    def __setstate__(self, state):
+        # Copies read the original's segments but never own (or delete) them.
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._sealing = False
+        self._directory = None
+        self._finalizer = None
+
+    def __len__(self) -> int:
+        _, base, hot = self._state
+        return base + len(hot)
+
+    def __iter__(self) -> Iterator["Transaction"]:
+        return self.iter_from(0)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step == 1:
+                return list(self.iter_from(start, stop))
+            return [self[j] for j in range(start, stop, step)]
+        segments, base, hot = self._state
+        n = base + len(hot)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("ledger index out of range")
+        if i >= base:
+            return hot[i - base]
+        seg = segments[bisect_right(segments, i, key=lambda s: s.start) - 1]
+        return SEGMENT_CACHE.get(seg)[i - seg.start]
+
+    @property
+    def segments(self) -> List[SegmentIndex]:
+        return list(self._state[0])
+
+    @property
+    def hot_rows(self) -> int:
+        return len(self._state[2])
+
+    def append(self, tx: "Transaction") -> None:
+        with self._lock:
+            self._state[2].append(tx)
+
+    def extend(self, rows) -> None:
+        """Append many rows (e.g. a restored history), sealing as it goes to honour the cap."""
+        cap = self.config.max_hot_rows
+        for tx in rows:
+            self.append(tx)
+            if cap is not None and self.hot_rows > cap:
+                self.seal()  # one segment of `_chunk()` rows at a time
+
+    def iter_from(self, start: int = 0, stop: Optional[int] = None) -> Iterator["Transaction"]:
+        """Iterate rows `[start, stop)`, decoding each cold segment once (uncached)."""
+        i = start
+        while True:
+            segments, base, hot = self._state
+            end = base + len(hot) if stop is None else min(stop, base + len(hot))
+            if i >= end:
+                return
+            if i >= base:
+                yield hot[i - base]
+                i += 1
+                continue
+            seg = segments[bisect_right(segments, i, key=lambda s: s.start) - 1]
+            seg_end = min(end, seg.start + seg.rows)
+            rows = SEGMENT_CACHE.peek(seg) or _read_segment(seg)
+            yield from rows[i - seg.start : seg_end - seg.start]
+            i = seg_end
+
+    def _chunk(self) -> int:
+        cfg = self.config
+        return max(1, min(cfg.segment_rows, cfg.max_hot_rows // 2))
+
+    def seal(self) -> None:
+        """Move the oldest rows to disk until at most `max_hot_rows` remain in memory.
+
+        Call without holding any bank-wide lock: the segment is written first and only the
+        new state is published under the ledger's own (append-sized) lock.
+        """
+        cfg = self.config
+        if cfg.max_hot_rows is None:
+            return
+        while True:
+            with self._lock:
+                if self._sealing or self.hot_rows <= cfg.max_hot_rows:
+                    return
+                self._sealing = True
+                _, base, hot = self._state
+                rows = hot[: self._chunk()]
+            try:
+                seg = self._write_segment(base, rows)
+            except BaseException:
+                with self._lock:
+                    self._sealing = False
+                raise
+            with self._lock:
+                segments, base, hot = self._state
+                self._state = (segments + [seg], base + len(rows), hot[len(rows) :])
+                self._sealing = False
+
+    def _segment_dir(self) -> str:
+        if self._directory is None:
+            self._directory = os.path.join(self.config.directory, uuid.uuid4().hex)
+            os.makedirs(self._directory, exist_ok=True)
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self._directory, ignore_errors=True
+            )
+        return self._directory
+
+    def _write_segment(self, base: int, rows: List["Transaction"]) -> SegmentIndex:
+        from .accounts import DEBIT_KINDS
+
+        first = rows[0]
+        delta = -first.amount if first.kind in DEBIT_KINDS else first.amount
+        path = os.path.join(self._segment_dir(), f"{base:012d}.jsonl.gz")
+        tmp = path + ".tmp"
+        body = "".join(json.dumps(tx.to_dict(), ensure_ascii=False) + "\n" for tx in rows)
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp, path)
+        return SegmentIndex(
+            path,
+            base,
+            len(rows),
+            first.timestamp,
+            rows[-1].timestamp,
+            round(first.balance_after - delta, 2),
+        )
+
+    def close(self) -> None:
+        """Delete this ledger's segment files now (the ledger must not be read afterwards)."""
+        if self._finalizer is not None:
+            self._finalizer()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from .accounts import Account
+
+
+@dataclass(frozen=True)
+class Posting:
+    """A balance movement produced by a rule; `delta` is signed (negative for debits)."""
+
+    account_id: str
+    kind: str  # 'fee', 'interest', 'yield'
+    delta: float
+    note: str = ""
+
+
+class AccountRule(ABC):
+    """Strategy for the end-of-day rules of an account product.
+
+    Rules must not mutate the account: they only read it and return postings, so they
+    can be evaluated in worker processes and merged back by `Bank.end_of_day`.
+    With `workers > 1` each chunk of accounts is pickled together with the rule objects it
+    uses, so rules must be picklable (instances of module-level classes). Workers receive
+    copies of the accounts' fields only: the ledger (`ledger`, `ledger_size`,
+    `iter_ledger()`) is not available to rules evaluated in parallel.
+    """
+
+    @abstractmethod
+    def evaluate(self, account: "Account") -> List[Posting]: ...
+
+
+class MaintenanceFeeRule(AccountRule):
+    """Charge `maintenance_fee` when the balance is below `minimum_balance`."""
+
+    def evaluate(self, account: "Account") -> List[Posting]:
+        fee_rate = getattr(account, "maintenance_fee", 0.0)
+        minimum = getattr(account, "minimum_balance", 0.0)
+        if account.balance < minimum and fee_rate > 0:
+            fee = min(fee_rate, account.balance) if account.balance > 0 else 0.0
+            if fee > 0:
+                return [
+                    Posting(
+                        account.id, "fee", -fee, f"maintenance (< {minimum} {account.currency})"
+                    )
+                ]
+        return []
+
+
+class DailyInterestRule(AccountRule):
+    """Credit `daily_interest_rate` over a positive balance."""
+
+    def evaluate(self, account: "Account") -> List[Posting]:
+        rate = getattr(account, "daily_interest_rate", 0.0)
+        if account.balance > 0 and rate > 0:
+            interest = account.balance * rate
+            return [Posting(account.id, "interest", interest, f"{rate*100:.4f}% daily")]
+        return []
+
+
+class RiskYieldRule(AccountRule):
+    """Deterministic yield by `risk_level` minus a daily management fee."""
+
+    def evaluate(self, account: "Account") -> List[Posting]:
+        # Simple stochastic-like yield: deterministic pseudo-variance by risk_level
+        # (No randomness to keep tests deterministic)
+        risk_level = getattr(account, "risk_level", 3)
+        fee_rate = getattr(account, "management_fee_daily", 0.0)
+        base_yield = 0.0003 + (risk_level - 3) * 0.00015  # [-0.0003 .. 0.0006] around 0.0003
+        gross = account.balance * base_yield if account.balance > 0 else 0.0
+        fee = account.balance * fee_rate if account.balance > 0 else 0.0
+        postings = []
+        if gross - fee != 0:
+            if gross:
+                postings.append(
+                    Posting(account.id, "yield", gross, f"base_yield {base_yield*100:.4f}%")
+                )
+            if fee:
+                postings.append(Posting(account.id, "fee", -fee, f"mgmt {fee_rate*100:.4f}%"))
+        return postings
+
+
+RULES: Dict[str, AccountRule] = {
+    "checking": MaintenanceFeeRule(),
+    "savings": DailyInterestRule(),
+    "investment": RiskYieldRule(),
+}
+
+
+def register_rule(name: str, rule: AccountRule) -> None:
+    """Register (or replace) a rule strategy; accounts select it by `rule=name`."""
+    if not isinstance(rule, AccountRule):
+        raise TypeError(f"Rule must be an AccountRule, got {type(rule).__name__}")
+    RULES[name] = rule
+
+
+def get_rule(name: str) -> AccountRule:
+    try:
+        return RULES[name]
+    except KeyError:
+        raise ValueError(f"Unknown account rule: {name}")
+
+
+def evaluate_chunk(chunk: List["Account"], rules: Dict[str, AccountRule]) -> List[Posting]:
+    """Evaluate accounts in order; the unit of work for the EOD process pool.
+
+    `rules` travels with the chunk, so workers never depend on the `RULES` registry they
+    inherited (spawned/forkserver workers only see rules registered at import time).
+    """
+    postings: List[Posting] = []
+    for account in chunk:
+        postings.extend(rules[account.rule].evaluate(account))
+    return postings
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from .accounts import Account, Transaction
+    from .bank import Bank
+
+
+class SnapshotManager:
+    """Multi-version read path for a Bank.
+
+    Opening a view is O(1): it bumps the epoch and remembers how many accounts exist.
+    Ledgers are append-only, so an account's state at any point is just
+    `(balance, ledger length)`; the first write to an account after a view opened copies
+    that pair into the open views (copy-on-write). Writers only hold `lock` for the
+    duration of a single posting, never for a whole export.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.epoch = 0
+        self.views: List["ReadView"] = []
+
+    def open(self, bank: "Bank") -> "ReadView":
+        with self.lock:
+            self.epoch += 1
+            view = ReadView(self, bank, len(bank._rows))
+            self.views.append(view)
+            return view
+
+    def close(self, view: "ReadView") -> None:
+        with self.lock:
+            if view in self.views:
+                self.views.remove(view)
+
+    def preserve(self, acc: "Account") -> None:
+        """Copy the pre-write state of `acc` into open views; call with `lock` held."""
+        if acc._epoch != self.epoch:
+            state = (acc.balance, len(acc._ledger))
+            for view in self.views:
+                view._saved.setdefault(acc.id, state)
+            acc._epoch = self.epoch
+
+
+class ReadView:
+    """Consistent point-in-time view of balances and ledgers (`with bank.read_view() as v:`)."""
+
+    def __init__(self, manager: SnapshotManager, bank: "Bank", n_rows: int):
+        self._manager = manager
+        self._rows = bank._rows
+        self._n_rows = n_rows
+        self._saved: Dict[str, Tuple[float, int]] = {}
+
+    def __enter__(self) -> "ReadView":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._manager.close(self)
+
+    def accounts(self) -> Iterator["Account"]:
+        """Accounts that existed when the view was opened, in opening order."""
+        for row in range(self._n_rows):
+            yield self._rows[row]
+
+    def state(self, acc: "Account") -> Tuple[float, int]:
+        """`(balance, ledger_length)` of `acc` as of the view."""
+        with self._manager.lock:
+            saved = self._saved.get(acc.id)
+            return saved if saved is not None else (acc.balance, len(acc._ledger))
+
+    def balance(self, acc: "Account") -> float:
+        return self.state(acc)[0]
+
+    def ledger(self, acc: "Account") -> Iterator["Transaction"]:
+        return islice(acc._ledger, self.state(acc)[1])
+
+    def snapshot(self, acc: "Account") -> Dict[str, Any]:
+        balance, n = self.state(acc)
+        return acc.snapshot(balance=balance, ledger_len=n)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import time
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .exceptions import RateNotAvailable, VelocityLimitExceeded
+
+if TYPE_CHECKING:
+    from .accounts import Account
+    from .fx import FxRates
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+
+
+class SlidingWindow:
+    """Count and sum over the last `span` seconds in a fixed ring of `buckets` slots.
+
+    Updates and reads are O(1) amortized (expired slots are cleared as time advances) and
+    memory is fixed per window (two flat arrays); the window edge has a resolution of
+    `span / buckets`.
+    """
+
+    __slots__ = ("width", "buckets", "counts", "sums", "slot", "count", "total")
+
+    def __init__(self, span: float, buckets: int = 60):
+        self.width = span / buckets
+        self.buckets = buckets
+        self.counts = array("l", [0]) * buckets
+        self.sums = array("d", [0.0]) * buckets
+        self.slot = 0  # absolute index of the newest slot
+        self.count = 0
+        self.total = 0.0
+
+    def _advance(self, now: float) -> int:
+        slot = int(now // self.width)
+        if slot > self.slot:
+            stale = min(slot - self.slot, self.buckets)
+            for s in range(slot - stale + 1, slot + 1):
+                i = s % self.buckets
+                self.count -= self.counts[i]
+                self.total -= self.sums[i]
+                self.counts[i] = 0
+                self.sums[i] = 0.0
+            self.slot = slot
+        return self.slot % self.buckets
+
+    def add(self, now: float, amount: float) -> None:
+        i = self._advance(now)
+        self.counts[i] += 1
+        self.sums[i] += amount
+        self.count += 1
+        self.total += amount
+
+    def totals(self, now: float) -> Tuple[int, float]:
+        self._advance(now)
+        return self.count, self.total
+
+
+@dataclass(frozen=True)
+class VelocityLimit:
+    """At most `max_count` postings / `max_amount` total of `kinds` within `window` seconds."""
+
+    name: str
+    window: int = MINUTE
+    max_count: Optional[int] = None
+    max_amount: Optional[float] = None
+    scope: str = "account"  # 'account' or 'customer' (account.owner_id)
+    kinds: FrozenSet[str] = frozenset({"withdraw", "transfer_out"})
+
+
+class VelocityGuard:
+    """Pre-posting hook enforcing `VelocityLimit`s from in-memory sliding windows.
+
+    `max_amount` is expressed in `currency`: amounts from accounts in other currencies are
+    converted through `fx` (Bank wires its own table). When no rate is available, the
+    amounts are tracked in a separate window per currency instead of being mixed.
+
+    Windows exist only while they hold postings: every `sweep_interval` seconds (default:
+    the shortest limit window) empty windows are dropped, so memory follows the accounts
+    active within the longest window rather than every account ever seen.
+    """
+
+    def __init__(
+        self,
+        limits: List[VelocityLimit],
+        clock: Callable[[], float] = time.monotonic,
+        currency: str = "BRL",
+        fx: Optional["FxRates"] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        for limit in limits:
+            if limit.scope not in ("account", "customer"):
+                raise ValueError(f"Unknown velocity scope: {limit.scope}")
+        self.limits = limits
+        self.clock = clock
+        self.currency = currency
+        self.fx = fx
+        if sweep_interval is None:
+            sweep_interval = min((limit.window for limit in limits), default=MINUTE)
+        self.sweep_interval = sweep_interval
+        self._windows: Dict[tuple, SlidingWindow] = {}
+        self._next_sweep = 0.0
+
+    def _now(self) -> float:
+        now = self.clock()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return now
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop windows with no postings left in their span; returns how many were dropped."""
+        now = self.clock() if now is None else now
+        empty = [key for key, w in list(self._windows.items()) if w.totals(now)[0] == 0]
+        for key in empty:
+            self._windows.pop(key, None)
+        self._next_sweep = now + self.sweep_interval
+        return len(empty)
+
+    def _normalize(self, account: "Account", amount: float) -> Tuple[float, str]:
+        """Amount in the guard currency when convertible, else in the account currency."""
+        if account.currency == self.currency:
+            return amount, self.currency
+        if self.fx is not None:
+            try:
+                return amount * self.fx.rate(account.currency, self.currency), self.currency
+            except RateNotAvailable:
+                pass
+        return amount, account.currency
+
+    def _key(self, limit: VelocityLimit, account: "Account", unit: str) -> tuple:
+        owner = account.id if limit.scope == "account" else account.owner_id
+        return (limit.scope, owner, limit.window, limit.kinds, unit)
+
+    def check(self, account: "Account", kind: str, amount: float) -> None:
+        """Raise `VelocityLimitExceeded` if posting `amount` would break a limit."""
+        now = self._now()
+        amount, unit = self._normalize(account, amount)
+        for limit in self.limits:
+            if kind not in limit.kinds:
+                continue
+            w = self._windows.get(self._key(limit, account, unit))
+            count, total = w.totals(now) if w is not None else (0, 0.0)
+            if limit.max_count is not None and count + 1 > limit.max_count:
+                raise VelocityLimitExceeded(f"{limit.name}: more than {limit.max_count} postings")
+            if limit.max_amount is not None and total + amount > limit.max_amount:
+                raise VelocityLimitExceeded(f"{limit.name}: over {limit.max_amount:.2f}")
+
+    def observe(self, account: "Account", kind: str, amount: float) -> None:
+        """Count a completed posting in every window that tracks `kind`."""
+        now = self._now()
+        amount, unit = self._normalize(account, amount)
+        seen = set()
+        for limit in self.limits:
+            if kind not in limit.kinds:
+                continue
+            key = self._key(limit, account, unit)
+            if key in seen:  # limits sharing a window count the posting once
+                continue
+            seen.add(key)
+            w = self._windows.get(key)
+            if w is None:
+                w = self._windows[key] = SlidingWindow(limit.window)
+            w.add(now, amount)
@@ -0,0 +1,247 @@
+"""Micro-benchmarks do pacote bank/ (python bench.py --help)."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from bank import (
+    AccountIdAllocator,
+    AccountRule,
+    Bank,
+    FxRates,
+    LedgerVerifier,
+    VelocityGuard,
+    VelocityLimit,
+    register_rule,
+)
+from bank import ledger as ledger_mod
+from bank.rules import DailyInterestRule
+from bank.velocity import DAY, HOUR, MINUTE
+
+
+class TieredRateRule(AccountRule):
+    """Regra sintética "cara": simula faixas/caps com `work` iterações por conta."""
+
+    def __init__(self, work: int):
+        self.work = work
+        self.inner = DailyInterestRule()
+
+    def evaluate(self, account):
+        acc = 0.0
+        for i in range(self.work):
+            acc += (account.balance * i) % 7
+        return self.inner.evaluate(account) if acc >= 0 else []
+
+
+def _timed(fn, *args, **kwargs) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t0
+
+
+def bench_eod(n_accounts: int, chunk_size: int, work: int) -> None:
+    """Escalonamento do end_of_day serial vs. pool de processos."""
+    kinds = ("checking", "savings", "investment")
+    register_rule("bench-tiered", TieredRateRule(work))
+
+    def build() -> Bank:
+        bank = Bank(name="Banco Aurora")
+        for i in range(n_accounts):
+            extra = {"rule": "bench-tiered"} if work else {}
+            bank.open_account("bench", kinds[i % 3], balance=float(i % 2000), **extra)
+        return bank
+
+    cpus = os.cpu_count() or 1
+    print(f"end_of_day: {n_accounts} contas, chunk={chunk_size}, work={work}, cpus={cpus}")
+    baseline = None
+    for workers in sorted({1, 2, 4, cpus}):
+        elapsed = _timed(build().end_of_day, workers=workers, chunk_size=chunk_size)
+        baseline = baseline or elapsed
+        print(
+            f"  workers={workers:<3} {elapsed:8.3f}s  {n_accounts / elapsed:12,.0f} contas/s"
+            f"  speedup={baseline / elapsed:5.2f}x"
+        )
+
+
+def bench_audit(n_accounts: int, rows: int) -> None:
+    """Verificação completa vs. incremental (a partir do último ponto verificado)."""
+    bank = Bank(name="Banco Aurora")
+    accounts = [bank.open_account("bench", "savings", balance=100.0) for _ in range(n_accounts)]
+    for acc in accounts:
+        for _ in range(rows):
+            acc.deposit(1.0)
+    total = n_accounts * (rows + 1)
+    verifier = LedgerVerifier()
+    full = _timed(verifier.verify_all, accounts, full=True)
+    for acc in accounts:
+        acc.deposit(1.0)
+    incremental = _timed(verifier.verify_all, accounts)
+    print(f"audit: {n_accounts} contas x {rows + 1} linhas = {total:,} linhas")
+    print(f"  completa     {full:8.3f}s  {total / full:12,.0f} linhas/s")
+    print(f"  incremental  {incremental:8.3f}s  ({n_accounts} linhas novas)")
+
+
+def bench_ids(n: int) -> None:
+    """Vazão do alocador de ids e da abertura de contas em lote."""
+    alloc = AccountIdAllocator()
+    one_by_one = _timed(lambda: [alloc.next_id() for _ in range(n)])
+    bulk = _timed(alloc.allocate, n)
+    bank = Bank(name="Banco Aurora")
+    specs = ({"owner_id": "bench", "kind": "savings"} for _ in range(n))
+    opening = _timed(bank.open_accounts, specs)
+    print(f"ids: {n:,} ids")
+    print(f"  next_id()       {n / one_by_one:12,.0f} ids/s")
+    print(f"  allocate(n)     {n / bulk:12,.0f} ids/s")
+    print(f"  open_accounts   {n / opening:12,.0f} contas/s")
+
+
+def bench_fx(n: int, n_currencies: int) -> None:
+    """Conversão via matriz pré-calculada e transferências entre moedas."""
+    codes = [f"C{i:02d}" for i in range(n_currencies)]
+    fx = FxRates.from_dict({"base": "BRL", "rates": {c: 1.0 + i / 10 for i, c in enumerate(codes)}})
+    pairs = [(codes[i % n_currencies], codes[(i * 7 + 3) % n_currencies]) for i in range(n)]
+    convert = _timed(lambda: [fx.convert(100.0, src, dst) for src, dst in pairs])
+    bank = Bank(name="Banco Aurora", fx=fx)
+    src = bank.open_account("bench", "checking", currency=codes[0], balance=1e12)
+    dst = bank.open_account("bench", "checking", currency=codes[1])
+    transfers = _timed(lambda: [bank.transfer(src.id, dst.id, 1.0) for _ in range(n)])
+    print(f"fx: {n:,} operações, {len(fx.currencies)} moedas")
+    print(f"  convert()   {n / convert:12,.0f} conversões/s")
+    print(f"  transfer()  {n / transfers:12,.0f} transferências/s")
+
+
+def bench_velocity(n: int) -> None:
+    """Latência adicionada por lançamento pelos limites de velocidade."""
+    limits = [
+        VelocityLimit(f"{scope}-{window}", window=window, max_count=10**9, scope=scope)
+        for scope in ("account", "customer")
+        for window in (MINUTE, HOUR, DAY)
+    ]
+    results = {}
+    for label, guard in (("sem guard", None), ("com guard", VelocityGuard(limits))):
+        bank = Bank(name="Banco Aurora", guard=guard)
+        accounts = [bank.open_account(f"c{i % 100}", "checking", balance=1e9) for i in range(1000)]
+        results[label] = _timed(lambda: [accounts[i % 1000].withdraw(1.0) for i in range(n)])
+    print(f"velocity: {n:,} saques, {len(limits)} limites (1 min/1 h/1 dia x conta/cliente)")
+    for label, elapsed in results.items():
+        print(f"  {label:<10} {elapsed / n * 1e6:8.2f} µs/lançamento")
+    extra = (results["com guard"] - results["sem guard"]) / n * 1e6
+    print(f"  acréscimo  {extra:8.2f} µs/lançamento")
+
+
+def bench_snapshot(n_accounts: int, seconds: float) -> None:
+    """Vazão de lançamentos com e sem exportações (dump_json) concorrentes."""
+    bank = Bank(name="Banco Aurora")
+    accounts = bank.open_accounts(
+        {"owner_id": "bench", "kind": "checking", "balance": 1e9} for _ in range(n_accounts)
+    )
+    open_view = _timed(lambda: bank.read_view().close())
+
+    def post_for(duration: float) -> int:
+        done, deadline = 0, time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            for acc in accounts[:100]:
+                acc.deposit(1.0)
+            done += 100
+        return done
+
+    alone = post_for(seconds)
+    dumps = [0]
+    stop = threading.Event()
+
+    def exporter():
+        while not stop.is_set():
+            bank.dump_json()
+            dumps[0] += 1
+
+    t = threading.Thread(target=exporter)
+    t.start()
+    concurrent = post_for(seconds)
+    stop.set()
+    t.join()
+    print(f"snapshot: {n_accounts:,} contas, read_view() em {open_view * 1e6:.1f} µs")
+    print(f"  lançamentos sozinhos     {alone / seconds:12,.0f} /s")
+    print(f"  com dump_json paralelo   {concurrent / seconds:12,.0f} /s  ({dumps[0]} dumps)")
+
+
+def bench_ledger(rows: int, hot_rows: int, segment_rows: int) -> None:
+    """Memória por conta e latência de leitura quente vs. fria (segmentos em disco)."""
+
+    def fill(config) -> tuple:
+        ledger_mod.LEDGER_CONFIG = config
+        tracemalloc.start()
+        acc = Bank(name="Banco Aurora").open_account("bench", "savings", balance=1.0)
+        for _ in range(rows):
+            acc.deposit(1.0)
+        mem = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return acc, mem
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, mem_all = fill(ledger_mod.LedgerConfig())
+        acc, mem_tiered = fill(ledger_mod.LedgerConfig(hot_rows, segment_rows, tmp))
+        log = acc._ledger
+        hot = _timed(lambda: [log[-1 - i % hot_rows] for i in range(10_000)]) / 10_000
+        cold = []
+        for seg in log.segments[:20]:
+            ledger_mod.SEGMENT_CACHE.clear()
+            cold.append(_timed(log.__getitem__, seg.start))
+        seg_rows = log.segments[0].rows
+        warm = _timed(lambda: [log[i % seg_rows] for i in range(10_000)]) / 10_000
+        scan = _timed(lambda: sum(1 for _ in acc.iter_ledger()))
+    print(f"ledger: {rows:,} linhas, hot={hot_rows}, segmento={seg_rows} linhas")
+    print(f"  memória tudo em RAM   {mem_all / 2**20:8.1f} MiB")
+    print(f"  memória em camadas    {mem_tiered / 2**20:8.1f} MiB ({len(log.segments)} segmentos)")
+    print(f"  leitura quente        {hot * 1e6:8.2f} µs/linha")
+    print(f"  leitura fria (disco)  {sum(cold) / len(cold) * 1e3:8.2f} ms/segmento")
+    print(f"  leitura fria em cache {warm * 1e6:8.2f} µs/linha")
+    print(f"  varredura completa    {scan:8.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco Aurora — benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    p_eod = sub.add_parser("eod", help="end_of_day serial vs. process pool")
+    p_eod.add_argument("--accounts", type=int, default=200_000)
+    p_eod.add_argument("--chunk-size", type=int, default=2048)
+    p_eod.add_argument(
+        "--work", type=int, default=0, help="custo sintético por conta (0 = regras padrão)"
+    )
+    p_audit = sub.add_parser("audit", help="ledger hash-chain verification")
+    p_audit.add_argument("--accounts", type=int, default=2_000)
+    p_audit.add_argument("--rows", type=int, default=500)
+    p_ids = sub.add_parser("ids", help="account id allocation / bulk opening")
+    p_ids.add_argument("--count", type=int, default=200_000)
+    p_fx = sub.add_parser("fx", help="FX conversion / cross-currency transfers")
+    p_fx.add_argument("--count", type=int, default=200_000)
+    p_fx.add_argument("--currencies", type=int, default=40)
+    p_vel = sub.add_parser("velocity", help="velocity-limit latency per posting")
+    p_vel.add_argument("--count", type=int, default=200_000)
+    p_snap = sub.add_parser("snapshot", help="posting throughput during concurrent exports")
+    p_snap.add_argument("--accounts", type=int, default=20_000)
+    p_snap.add_argument("--seconds", type=float, default=3.0)
+    p_led = sub.add_parser("ledger", help="tiered ledger memory and cold-read latency")
+    p_led.add_argument("--rows", type=int, default=200_000)
+    p_led.add_argument("--hot-rows", type=int, default=1_000)
+    p_led.add_argument("--segment-rows", type=int, default=4_096)
+    args = parser.parse_args()
+
+    if args.bench == "eod":
+        bench_eod(args.accounts, args.chunk_size, args.work)
+    elif args.bench == "audit":
+        bench_audit(args.accounts, args.rows)
+    elif args.bench == "ids":
+        bench_ids(args.count)
+    elif args.bench == "fx":
+        bench_fx(args.count, args.currencies)
+    elif args.bench == "velocity":
+        bench_velocity(args.count)
+    elif args.bench == "snapshot":
+        bench_snapshot(args.accounts, args.seconds)
+    elif args.bench == "ledger":
+        bench_ledger(args.rows, args.hot_rows, args.segment_rows)
@@ -43,7 +43,7 @@ def withdraw(account_id: str, amount: float):
 def transfer(from_id: str, to_id: str, amount: float):
     a = bank.get_account(from_id)
     b = bank.get_account(to_id)
-    a.transfer_to(b, amount)
+    bank.transfer(a.id, b.id, amount)
     print({"from": a.snapshot(), "to": b.snapshot()})
 
 
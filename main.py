@@ -45,7 +45,7 @@ def demo_bank(return_accounts: bool = False) -> Dict[str, object] | None:
         print(acc.id, acc.__class__.__name__, pretty_money(acc.balance, acc.currency))
 
     print("\n== Ledger conta poupança ==")
-    for t in a2.ledger:
+    for t in a2.iter_ledger():
         print(
             f"{t.timestamp:%Y-%m-%d %H:%M:%S} | {t.kind:<12} | {pretty_money(t.amount)} | saldo={pretty_money(t.balance_after)} | {t.note}"
         )
@@ -60,36 +60,38 @@ def demo_bank(return_accounts: bool = False) -> Dict[str, object] | None:
 
 def print_ledger(acc):
     print(f"\n— Extrato {acc.__class__.__name__} ({acc.id}) —")
-    if not acc.ledger:
+    if not acc.ledger_size:
         print("(sem movimentações)")
         return
-    for t in acc.ledger:
+    for t in acc.iter_ledger():
         print(
             f"{t.timestamp:%Y-%m-%d %H:%M:%S} | {t.kind:<12} | {pretty_money(t.amount, acc.currency)} | saldo={pretty_money(t.balance_after, acc.currency)} | {t.note}"
         )
 
 
 def export_ledger(acc, fmt: str, out_path: str):
-    """Exporta o ledger da conta em CSV ou JSON."""
-    if not acc.ledger:
+    """Exporta o ledger da conta em CSV ou JSON (em streaming, sem carregar o histórico todo)."""
+    if not acc.ledger_size:
         print("(sem movimentações)")
         return
     if fmt.lower() == "json":
-        payload = [
-            {
-                "timestamp": t.timestamp.isoformat(),
-                "kind": t.kind,
-                "amount": round(t.amount, 2),
-                "balance_after": round(t.balance_after, 2),
-                "note": t.note,
-                "currency": getattr(acc, "currency", "BRL"),
-                "account_id": acc.id,
-                "account_type": acc.__class__.__name__,
-            }
-            for t in acc.ledger
-        ]
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+            f.write("[")
+            for i, t in enumerate(acc.iter_ledger()):
+                row = {
+                    "timestamp": t.timestamp.isoformat(),
+                    "kind": t.kind,
+                    "amount": round(t.amount, 2),
+                    "balance_after": round(t.balance_after, 2),
+                    "note": t.note,
+                    "currency": getattr(acc, "currency", "BRL"),
+                    "account_id": acc.id,
+                    "account_type": acc.__class__.__name__,
+                }
+                # mesmo layout de json.dump(lista, indent=2)
+                item = json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                f.write(("," if i else "") + "\n  " + item)
+            f.write("\n]")
     elif fmt.lower() == "csv":
         with open(out_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -105,7 +107,7 @@ def export_ledger(acc, fmt: str, out_path: str):
                     "account_type",
                 ]
             )
-            for t in acc.ledger:
+            for t in acc.iter_ledger():
                 writer.writerow(
                     [
                         t.timestamp.isoformat(),
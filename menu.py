@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import math
+import shlex
+import sys
+import time
 from dataclasses import dataclass
+from typing import Iterable, TextIO
 
 
 # ===== Modelo OO =====
@@ -74,6 +80,13 @@ class ContaInvestimento(Conta):
             self.depositar(ganho)
 
 
+TIPOS_CONTA: dict[str, type[Conta]] = {
+    "corrente": ContaCorrente,
+    "poupanca": ContaPoupanca,
+    "investimento": ContaInvestimento,
+}
+
+
 # ===== Camada "aplicação" (menu/console) =====
 class BancoConsole:
     def __init__(self):
@@ -90,20 +103,18 @@ class BancoConsole:
         saldo_inicial = float(input("Saldo inicial (R$): ") or "0")
 
         if tipo == "corrente":
-            taxa = float(input("Taxa de manutenção (R$) [padrão 10]: ") or "10")
-            conta = ContaCorrente(numero, titular, saldo_inicial, taxa)
+            extras = [float(input("Taxa de manutenção (R$) [padrão 10]: ") or "10")]
         elif tipo == "poupanca":
-            rendimento = float(input("Rendimento (ex.: 0.02 para 2%): ") or "0.02")
-            conta = ContaPoupanca(numero, titular, saldo_inicial, rendimento)
+            extras = [float(input("Rendimento (ex.: 0.02 para 2%): ") or "0.02")]
         elif tipo == "investimento":
             taxa_adm = float(input("Taxa adm (ex.: 0.01 para 1%): ") or "0.01")
             rendimento = float(input("Rendimento (ex.: 0.05 para 5%): ") or "0.05")
-            conta = ContaInvestimento(numero, titular, saldo_inicial, taxa_adm, rendimento)
+            extras = [taxa_adm, rendimento]
         else:
             print("Tipo inválido.")
             return
 
-        self.contas[numero] = conta
+        self.contas[numero] = TIPOS_CONTA[tipo](numero, titular, saldo_inicial, *extras)
         print("Conta criada com sucesso.")
 
     def depositar(self):
@@ -187,5 +198,208 @@ class BancoConsole:
                 print("Opção inválida.")
 
 
+# ===== Modo lote (scripts de conciliação) =====
+# Uma operação por linha; linhas vazias e comentários (#) são ignorados:
+#   criar <numero> <titular> <corrente|poupanca|investimento> [saldo] [parâmetros do tipo...]
+#   depositar <numero> <valor>
+#   sacar <numero> <valor>
+#   transferir <origem> <destino> <valor>
+#   eod
+# Titulares com espaço vão entre aspas: criar 001 "Maria Silva" corrente 100
+ARIDADE = {
+    "criar": (3, 6),
+    "depositar": (2, 2),
+    "sacar": (2, 2),
+    "transferir": (3, 3),
+    "eod": (0, 0),
+}
+PARAMETROS_TIPO = {"corrente": 1, "poupanca": 1, "investimento": 2}
+# Parâmetros extras de cada tipo, na ordem, com o teto (exclusivo) quando houver. Todos devem
+# ser positivos: taxa/rendimento zero fariam o end_of_day() sacar/depositar R$ 0.
+LIMITES_TIPO = {
+    "corrente": [("taxa", None)],
+    "poupanca": [("rendimento", None)],
+    "investimento": [("taxa_adm", 1.0), ("rendimento", None)],
+}
+
+
+def _numero(texto: str, nome: str) -> float:
+    valor = float(texto)
+    if not math.isfinite(valor):
+        raise ValueError(f"{nome} inválido: {texto}")
+    return valor
+
+
+def _valor(texto: str) -> float:
+    valor = _numero(texto, "Valor")
+    if valor <= 0:
+        raise ValueError(f"O valor deve ser positivo: {texto}")
+    return valor
+
+
+def _parametros_tipo(tipo: str, textos: list[str]) -> list[float]:
+    extras = []
+    for (nome, maximo), texto in zip(LIMITES_TIPO[tipo], textos):
+        valor = _numero(texto, nome)
+        if valor <= 0:
+            raise ValueError(f"{nome} deve ser positivo: {texto}")
+        if maximo is not None and valor >= maximo:
+            raise ValueError(f"{nome} deve ser menor que {maximo}: {texto}")
+        extras.append(valor)
+    return extras
+
+
+def interpretar_linha(linha: str) -> tuple[str, list] | None:
+    """Valida uma linha do script e converte os valores; None para linha vazia/comentário."""
+    if '"' in linha or "'" in linha:
+        partes = shlex.split(linha, comments=True)
+    else:
+        partes = linha.split("#", 1)[0].split()
+    if not partes:
+        return None
+    op, args = partes[0].lower(), partes[1:]
+    if op not in ARIDADE:
+        raise ValueError(f"Operação desconhecida: {op}")
+    minimo, maximo = ARIDADE[op]
+    if not minimo <= len(args) <= maximo:
+        raise ValueError(f"'{op}' espera {minimo}..{maximo} argumentos, recebeu {len(args)}.")
+    if op == "criar":
+        tipo = args[2].lower()
+        if tipo not in TIPOS_CONTA:
+            raise ValueError(f"Tipo inválido: {tipo}")
+        if len(args) - 4 > PARAMETROS_TIPO[tipo]:
+            raise ValueError(f"'{tipo}' aceita até {PARAMETROS_TIPO[tipo]} parâmetro(s) extra(s).")
+        saldo = []
+        if len(args) > 3:
+            saldo = [_numero(args[3], "Saldo")]
+            if saldo[0] < 0:
+                raise ValueError(f"Saldo inicial negativo: {args[3]}")
+        return op, [args[0], args[1], tipo, *saldo, *_parametros_tipo(tipo, args[4:])]
+    if op in ("depositar", "sacar"):
+        return op, [args[0], _valor(args[1])]
+    if op == "transferir":
+        return op, [args[0], args[1], _valor(args[2])]
+    return op, []
+
+
+class BancoLote:
+    """Aplica scripts de operações nas contas de um BancoConsole, sem input() interativo."""
+
+    def __init__(self, console: BancoConsole, saida: TextIO = sys.stdout, bloco: int = 10_000):
+        self.contas = console.contas
+        self.saida = saida
+        self.bloco = bloco
+        self.processadas = 0
+        self.erros = 0
+        self._acoes = {
+            "criar": self._criar,
+            "depositar": self._depositar,
+            "sacar": self._sacar,
+            "transferir": self._transferir,
+            "eod": self._eod,
+        }
+
+    def _criar(self, numero, titular, tipo, saldo=0.0, *extras):
+        if numero in self.contas:
+            raise ValueError("Já existe conta com esse número.")
+        self.contas[numero] = TIPOS_CONTA[tipo](numero, titular, saldo, *extras)
+
+    def _depositar(self, numero, valor):
+        self.contas[numero].depositar(valor)
+
+    def _sacar(self, numero, valor):
+        self.contas[numero].sacar(valor)
+
+    def _transferir(self, origem, destino, valor):
+        c_origem = self.contas[origem]
+        c_destino = self.contas[destino]
+        c_origem.sacar(valor)
+        c_destino.depositar(valor)
+
+    def _eod(self) -> list[str]:
+        # Uma conta com problema não impede o fechamento das demais.
+        falhas = []
+        for c in self.contas.values():
+            try:
+                c.end_of_day()
+            except (ValueError, ArithmeticError) as e:
+                falhas.append(f"conta {c.numero}: {e}")
+        return falhas
+
+    def _aplicar(self, bloco: list[tuple[int, str]], mensagens: list[str]) -> None:
+        # 1ª passada: interpreta e valida o bloco inteiro; 2ª: aplica só as linhas válidas.
+        validas = []
+        for n, linha in bloco:
+            try:
+                op = interpretar_linha(linha)
+            except ValueError as e:
+                self.processadas += 1
+                self.erros += 1
+                mensagens.append(f"linha {n}: {e}\n")
+                continue
+            if op is not None:
+                validas.append((n, op))
+        acoes = self._acoes
+        for n, (op, args) in validas:
+            try:
+                falhas = acoes[op](*args)
+                if falhas:
+                    self.erros += 1
+                    mensagens.extend(f"linha {n}: {f}\n" for f in falhas)
+            except KeyError as e:
+                self.erros += 1
+                mensagens.append(f"linha {n}: Conta não encontrada: {e.args[0]}\n")
+            except ValueError as e:
+                self.erros += 1
+                mensagens.append(f"linha {n}: {e}\n")
+        self.processadas += len(validas)
+
+    def executar(self, linhas: Iterable[str]) -> dict:
+        """Processa as linhas em blocos, com saída bufferizada, e imprime o resumo final."""
+        inicio = time.perf_counter()
+        bloco: list[tuple[int, str]] = []
+        mensagens: list[str] = []
+        for n, linha in enumerate(linhas, 1):
+            bloco.append((n, linha))
+            if len(bloco) >= self.bloco:
+                self._aplicar(bloco, mensagens)
+                self.saida.writelines(mensagens)
+                bloco, mensagens = [], []
+        self._aplicar(bloco, mensagens)
+        self.saida.writelines(mensagens)
+        decorrido = time.perf_counter() - inicio
+        resumo = {
+            "processadas": self.processadas,
+            "ok": self.processadas - self.erros,
+            "erros": self.erros,
+            "segundos": decorrido,
+            "ops_s": self.processadas / decorrido if decorrido else 0.0,
+        }
+        self.saida.write(
+            f"Processadas: {resumo['processadas']} | OK: {resumo['ok']} | "
+            f"Erros: {resumo['erros']} | {decorrido:.3f}s ({resumo['ops_s']:,.0f} ops/s)\n"
+        )
+        self.saida.flush()
+        return resumo
+
+
 if __name__ == "__main__":
-    BancoConsole().menu()
+    parser = argparse.ArgumentParser(description="Banco Aurora — menu interativo / modo lote")
+    parser.add_argument(
+        "--script",
+        metavar="ARQUIVO",
+        help="Executa as operações do arquivo sem interação ('-' lê da entrada padrão)",
+    )
+    args = parser.parse_args()
+
+    if args.script:
+        console = BancoConsole()
+        if args.script == "-":
+            resumo = BancoLote(console).executar(sys.stdin)
+        else:
+            with open(args.script, encoding="utf-8") as f:
+                resumo = BancoLote(console).executar(f)
+        # Código de saída != 0 quando alguma linha falhou, para scripts de conciliação.
+        sys.exit(1 if resumo["erros"] else 0)
+    else:
+        BancoConsole().menu()
@@ -0,0 +1,4 @@
+import os
+
+# Tests sign ledger checkpoints with their own key instead of the public dev fallback.
+os.environ.setdefault("BANK_LEDGER_KEY", "test-ledger-key")
@@ -1,4 +1,34 @@
-from bank import Bank, Customer
+import functools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from bank import (
+    AccountIdAllocator,
+    AccountRule,
+    Bank,
+    CurrencyMismatch,
+    Customer,
+    DuplicateAccount,
+    FxRates,
+    LedgerIntegrityError,
+    LedgerVerifier,
+    Posting,
+    RateNotAvailable,
+    VelocityGuard,
+    VelocityLimit,
+    VelocityLimitExceeded,
+    register_rule,
+)
+from bank import bank as bank_mod
+from bank import ledger as ledger_mod
+from bank.accounts import Transaction
+from bank.audit import CHECKPOINT_INTERVAL, GENESIS_HASH, chain_hash
+from bank.ids import SEQ_LIMIT, is_valid_id
+from bank.velocity import HOUR, MINUTE
 
 
 def test_transfer_and_eod():
@@ -22,3 +52,288 @@ def test_dump_and_load():
     bank2 = Bank.load_json(s)
     assert bank2.name == "Banco Aurora"
     assert len(bank2.accounts) == 1
+
+
+class FlatBonus(AccountRule):
+    def evaluate(self, account):
+        return [Posting(account.id, "interest", 1.0, "campaign bonus")]
+
+
+class BrokenRule(AccountRule):
+    def evaluate(self, account):
+        raise ValueError("rate table unavailable")
+
+
+def test_custom_rule_and_parallel_eod_match_serial(monkeypatch):
+    register_rule("test-bonus", FlatBonus())
+
+    def build():
+        bank = Bank(name="Banco Aurora")
+        for i in range(20):
+            bank.open_account("c", "checking", balance=float(i * 5))
+            bank.open_account("c", "savings", balance=100.0 + i)
+            bank.open_account("c", "investment", balance=1000.0, risk_level=1 + i % 5)
+        bonus = bank.open_account("c", "savings", balance=10.0, rule="test-bonus")
+        return bank, bonus
+
+    serial, bonus = build()
+    serial.end_of_day()
+    assert bonus.balance == 11.0
+    # Spawned workers never see runtime registrations: the rules travel with each chunk.
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(
+        bank_mod, "ProcessPoolExecutor", functools.partial(ProcessPoolExecutor, mp_context=spawn)
+    )
+    parallel, _ = build()
+    parallel.end_of_day(workers=2, chunk_size=7)
+    assert [a.balance for a in serial.accounts.values()] == [
+        a.balance for a in parallel.accounts.values()
+    ]
+    assert [len(a.ledger) for a in serial.accounts.values()] == [
+        len(a.ledger) for a in parallel.accounts.values()
+    ]
+
+
+def test_parallel_eod_posts_nothing_when_a_chunk_fails():
+    register_rule("test-broken", BrokenRule())
+    bank = Bank(name="Banco Aurora")
+    accounts = [bank.open_account("c", "savings", balance=100.0) for _ in range(6)]
+    bank.open_account("c", "savings", balance=100.0, rule="test-broken")
+    with pytest.raises(ValueError):
+        bank.end_of_day(workers=2, chunk_size=2)
+    assert [a.balance for a in accounts] == [100.0] * 6 and accounts[0].ledger_size == 1
+
+
+def test_ledger_chain_verifies_incrementally_and_detects_tampering():
+    bank = Bank(name="Banco Aurora")
+    a = bank.open_account("c", "savings", balance=100.0)
+    b = bank.open_account("c", "checking", balance=0.0)
+    for _ in range(CHECKPOINT_INTERVAL + 10):
+        a.deposit(1.0)
+    a.transfer_to(b, 30.0)
+    bank.end_of_day()
+    assert a._checkpoints and a._checkpoints[0].index == CHECKPOINT_INTERVAL
+
+    verifier = LedgerVerifier()
+    assert verifier.verify_all(bank.accounts.values()) == {a.id: None, b.id: None}
+    a.deposit(5.0)
+    assert verifier.verify(a) == 1  # only the new row is replayed
+
+    bank2 = Bank.load_json(bank.dump_json())
+    assert LedgerVerifier().verify(bank2.get_account(a.id), full=True) == len(a.ledger)
+
+    a._ledger[3].amount = 999.0
+    assert LedgerVerifier().verify_all([a], full=True)[a.id]
+    b.balance += 10
+    assert "balance" in LedgerVerifier().verify_all([b])[b.id]
+
+
+def test_rechained_ledger_without_the_key_fails_verification():
+    bank = Bank(name="Banco Aurora")
+    a = bank.open_account("c", "savings", balance=100.0)
+    for _ in range(50):
+        a.deposit(1.0)
+    data = json.loads(bank.dump_json())
+    acc = data["accounts"][a.id]
+    assert acc["checkpoints"] == []  # well below CHECKPOINT_INTERVAL
+    # Someone without BANK_LEDGER_KEY inflates row 1 and recomputes everything after it.
+    rows = [Transaction.from_dict(r) for r in acc["ledger"]]
+    rows[1].amount = 1000.0
+    head, balance = GENESIS_HASH, 0.0
+    for tx in rows:
+        balance += tx.amount
+        tx.balance_after = balance
+        tx.hash = chain_hash(head, a.id, tx, key=b"guessed-key")
+        head = tx.hash
+    acc["ledger"], acc["balance"] = [tx.to_dict() for tx in rows], balance
+    forged = Bank.load_json(json.dumps(data)).get_account(a.id)
+    assert forged.balance == 1149.0
+    with pytest.raises(LedgerIntegrityError, match="hash chain break at row 0"):
+        LedgerVerifier().verify(forged, full=True)
+
+
+def test_id_allocator_unique_sortable_and_dense_rows():
+    frozen = AccountIdAllocator(node=7, clock=lambda: 1_700_000_000_000_000_000)
+    ids = frozen.allocate(SEQ_LIMIT + 5) + [frozen.next_id()]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(is_valid_id(i) for i in ids)
+    assert not is_valid_id(ids[0][:-1] + str((int(ids[0][-1]) + 1) % 10))
+
+    bank = Bank(name="Banco Aurora")
+    opened = bank.open_accounts([{"owner_id": "c", "kind": "savings"} for _ in range(3)])
+    assert [bank.row_of(a.id) for a in opened] == [0, 1, 2]
+    assert bank.account_at(1) is opened[1]
+    with pytest.raises(DuplicateAccount):
+        bank._add(opened[0])
+
+
+def test_cross_currency_transfer_uses_fx_matrix(tmp_path):
+    path = tmp_path / "fx.json"
+    path.write_text(json.dumps({"base": "BRL", "rates": {"USD": 0.2, "EUR": 0.16}}))
+    fx = FxRates(str(path))
+    assert fx.rate("USD", "BRL") == pytest.approx(5.0)
+    assert fx.rate("USD", "EUR") == pytest.approx(0.8)
+
+    bank = Bank(name="Banco Aurora", fx=fx)
+    usd = bank.open_account("c", "checking", currency="USD", balance=100.0)
+    brl = bank.open_account("c", "savings", currency="BRL")
+    bank.transfer(usd.id, brl.id, 10.0)
+    assert (usd.balance, brl.balance) == (90.0, 50.0)
+    assert "@ 5.000000" in brl.ledger[-1].note
+    with pytest.raises(CurrencyMismatch):
+        usd.transfer_to(brl, 1.0)  # no fx table given
+
+    path.write_text(json.dumps({"base": "BRL", "rates": {"USD": 0.25}}))
+    assert fx.reload(force=True)
+    assert fx.rate("USD", "BRL") == pytest.approx(4.0)
+    with pytest.raises(RateNotAvailable):
+        fx.rate("USD", "EUR")
+
+
+def test_velocity_guard_blocks_bursts_per_account_and_customer():
+    now = [0.0]
+    guard = VelocityGuard(
+        [
+            VelocityLimit("3 saques/min", window=MINUTE, max_count=3),
+            VelocityLimit("500/h por cliente", window=HOUR, max_amount=500.0, scope="customer"),
+        ],
+        clock=lambda: now[0],
+    )
+    bank = Bank(name="Banco Aurora", guard=guard)
+    a = bank.open_account("c1", "checking", balance=1000.0)
+    b = bank.open_account("c1", "checking", balance=1000.0)
+    for _ in range(3):
+        a.withdraw(10.0)
+    with pytest.raises(VelocityLimitExceeded):
+        a.transfer_to(b, 10.0)
+    assert a.balance == 970.0  # blocked before posting
+    now[0] += MINUTE
+    a.withdraw(10.0)
+    with pytest.raises(VelocityLimitExceeded):
+        b.withdraw(470.1)  # same customer: 40 + 470.1 > 500 within the hour
+    now[0] += HOUR
+    b.withdraw(470.1)
+
+
+def test_velocity_windows_of_idle_accounts_are_dropped():
+    now = [0.0]
+    limits = [
+        VelocityLimit(f"{scope}-{window}", window=window, max_count=100, scope=scope)
+        for scope in ("account", "customer")
+        for window in (MINUTE, HOUR)
+    ]
+    guard = VelocityGuard(limits, clock=lambda: now[0])
+    bank = Bank(name="Banco Aurora", guard=guard)
+    accounts = [bank.open_account(f"c{i}", "checking", balance=100.0) for i in range(50)]
+    for acc in accounts:
+        acc.withdraw(1.0)
+    assert len(guard._windows) == 50 * 4
+    now[0] += MINUTE
+    accounts[0].withdraw(1.0)
+    assert len(guard._windows) == 50 * 2 + 2  # minute windows expired, hour ones still hold
+    now[0] += HOUR
+    accounts[0].withdraw(1.0)
+    assert len(guard._windows) == 4
+
+
+def test_read_view_is_point_in_time_while_posting_continues():
+    bank = Bank(name="Banco Aurora")
+    a = bank.open_account("c", "checking", balance=100.0)
+    b = bank.open_account("c", "savings", balance=0.0)
+    with bank.read_view() as view:
+        a.transfer_to(b, 40.0)
+        bank.open_account("c", "savings", balance=5.0)
+        assert (view.balance(a), view.balance(b)) == (100.0, 0.0)
+        assert len(list(view.ledger(a))) == 1 and list(view.ledger(b)) == []
+        assert [acc.id for acc in view.accounts()] == [a.id, b.id]
+        assert view.snapshot(a)["balance"] == 100.0
+    assert bank._versions.views == []
+    dumped = json.loads(bank.dump_json())["accounts"]
+    assert dumped[a.id]["balance"] == 60.0 and len(dumped) == 3
+
+
+def test_tiered_ledger_spills_cold_rows_and_reads_back(tmp_path, monkeypatch):
+    cfg = ledger_mod.LedgerConfig(max_hot_rows=10, segment_rows=8, directory=str(tmp_path))
+    monkeypatch.setattr(ledger_mod, "LEDGER_CONFIG", cfg)
+    ledger_mod.SEGMENT_CACHE.clear()
+    bank = Bank(name="Banco Aurora")
+    a = bank.open_account("c", "savings", balance=1.0)
+    b = bank.open_account("c", "checking", balance=0.0)
+    for i in range(60):
+        a.deposit(1.0, f"d{i}")
+        assert a._ledger.hot_rows <= 10  # hard cap, segments of max_hot_rows // 2
+    a.transfer_to(b, 1.0)
+    log = a._ledger
+    assert len(log) == 62 and log.hot_rows <= 10 and len(log.segments) >= 10
+    assert log.segments[1].start == 5 and log.segments[1].start_balance == 5.0
+    assert [t.note for t in a.iter_ledger(5)][:3] == ["d4", "d5", "d6"]
+    assert ledger_mod.SEGMENT_CACHE._rows == {}  # streaming reads bypass the cache
+    assert log[0].kind == "opening" and log[-1].kind == "transfer_out"
+    assert [t.balance_after for t in log[6:10]] == [7.0, 8.0, 9.0, 10.0]
+    assert LedgerVerifier().verify(a, full=True) == 62
+
+    restored = ledger_mod.TieredLedger()
+    peak = [0]
+
+    def rows(source):
+        for tx in source:
+            peak[0] = max(peak[0], restored.hot_rows)
+            yield tx
+
+    restored.extend(rows(log))  # restores stay within the cap while loading
+    assert len(restored) == 62 and peak[0] <= 10 and restored[-1].hash == log[-1].hash
+    restored.close()
+
+    seg_dir = os.path.dirname(log.segments[0].path)
+    a.restore_ledger([t.to_dict() for t in log], [])  # old ledger's segments are released
+    del log
+    assert not os.path.exists(seg_dir)
+    assert LedgerVerifier().verify(a, full=True) == 62
+
+
+def test_loaded_ids_seed_the_allocator_against_clock_skew():
+    future = AccountIdAllocator(clock=lambda: 2_000_000_000_000_000_000)  # year 2033
+    bank = Bank(name="Banco Aurora", ids=future)
+    saved = [bank.open_account("c", "savings").id for _ in range(3)]
+    # Restart on a host whose clock is behind the persisted ids.
+    loaded = Bank.load_json(bank.dump_json())
+    new = loaded.open_account("c", "savings").id
+    assert new not in saved and new > max(saved)
+
+
+def test_fx_pairs_triangulate_and_mtime_reload_keeps_last_good_table(tmp_path):
+    path = tmp_path / "fx.json"
+    path.write_text(json.dumps({"base": "BRL", "rates": {"USD": 0.2}, "pairs": {"EUR/USD": 1.25}}))
+    fx = FxRates(str(path), check_interval=0)
+    assert fx.rate("EUR", "BRL") == pytest.approx(6.25)  # EUR only quoted against USD
+
+    path.write_text(json.dumps({"base": "BRL", "rates": {"USD": 0.25}}))
+    os.utime(path, (1, fx._mtime + 10))
+    assert fx.maybe_reload() and fx.rate("USD", "BRL") == pytest.approx(4.0)
+    assert not fx.maybe_reload()  # unchanged mtime: no re-read
+
+    path.write_text('{"base": "BRL", "rat')  # half-written file
+    os.utime(path, (1, fx._mtime + 20))
+    assert not fx.maybe_reload() and fx.rate("USD", "BRL") == pytest.approx(4.0)
+    path.unlink()
+    assert not fx.maybe_reload() and fx.rate("USD", "BRL") == pytest.approx(4.0)
+
+
+def test_customer_velocity_amounts_are_normalized_across_currencies():
+    limit = VelocityLimit("1000 BRL/h", window=3600, max_amount=1000.0, scope="customer")
+    fx = FxRates.from_dict({"base": "BRL", "rates": {"JPY": 30.0}})
+    bank = Bank(name="Banco Aurora", fx=fx, guard=VelocityGuard([limit]))
+    brl = bank.open_account("c1", "checking", balance=5000.0)
+    jpy = bank.open_account("c1", "checking", currency="JPY", balance=100_000.0)
+    brl.withdraw(10.0)
+    jpy.withdraw(1000.0)  # ~33 BRL, not 1000
+    with pytest.raises(VelocityLimitExceeded):
+        jpy.withdraw(29_000.0)  # ~967 BRL: 10 + 33 + 967 > 1000
+
+    # Without a rate the currencies get separate windows instead of being summed.
+    bank2 = Bank(name="Banco Aurora", guard=VelocityGuard([limit]))
+    brl2 = bank2.open_account("c1", "checking", balance=5000.0)
+    jpy2 = bank2.open_account("c1", "checking", currency="JPY", balance=5000.0)
+    brl2.withdraw(10.0)
+    jpy2.withdraw(995.0)
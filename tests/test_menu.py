@@ -0,0 +1,59 @@
+import io
+
+from menu import BancoConsole, BancoLote, ContaCorrente, ContaInvestimento, ContaPoupanca
+
+
+def test_batch_mode_applies_script_and_reports_errors():
+    script = """
+    # conciliação da agência
+    criar 001 "Maria Silva" corrente 100 5
+    criar 002 Bob poupanca 0 0.5
+    criar 003 Ana investimento 10 0.1 0.2 9
+    depositar 001 50
+    transferir 001 002 30   # para a poupança
+    sacar 002 999
+    depositar 404 10
+    sacar 001 abc
+    eod
+    """
+    console = BancoConsole()
+    out = io.StringIO()
+    resumo = BancoLote(console, saida=out, bloco=3).executar(script.splitlines())
+
+    assert resumo["processadas"] == 9 and resumo["erros"] == 4 and resumo["ok"] == 5
+    assert isinstance(console.contas["001"], ContaCorrente)
+    assert console.contas["001"].titular == "Maria Silva"
+    assert console.contas["001"].saldo == 115.0  # 100 + 50 - 30 - taxa 5
+    assert isinstance(console.contas["002"], ContaPoupanca)
+    assert console.contas["002"].saldo == 45.0  # 30 + 50%
+    log = out.getvalue()
+    assert "linha 5:" in log and "linha 9: Conta não encontrada: 404" in log
+    assert log.rstrip().splitlines()[-1].startswith("Processadas: 9 | OK: 5 | Erros: 4")
+
+
+def test_batch_mode_rejects_non_finite_values_and_bad_rates():
+    script = """
+    criar 001 Ana corrente 100 nan
+    criar 002 Bob poupanca 0 -0.5
+    criar 003 Caio investimento 10 1.5 0.1
+    criar 004 Duda poupanca inf
+    criar 005 Eva investimento 10 0.1 0.05
+    criar 006 Gil corrente 10 0
+    depositar 005 nan
+    sacar 005 -1
+    transferir 005 005 0
+    eod
+    """
+    console = BancoConsole()
+    console.contas["900"] = ContaInvestimento("900", "Zé", 100.0, taxa_adm=2.0)
+    out = io.StringIO()
+    resumo = BancoLote(console, saida=out).executar(script.splitlines())
+
+    assert resumo["processadas"] == 10 and resumo["erros"] == 9
+    assert list(console.contas) == ["900", "005"]
+    # 10 - 10% + 5%; o eod seguiu após a falha da conta 900
+    assert console.contas["005"].saldo == 9.45
+    log = out.getvalue()
+    assert "linha 3: rendimento deve ser positivo" in log
+    assert "linha 4: taxa_adm deve ser menor que 1.0" in log
+    assert "linha 11: conta 900: Saldo insuficiente." in log